@@ -1,13 +1,57 @@
 import sys
 import os
+import signal
 import subprocess
 
 
+def exit_status(info):
+    """ Maps an os.waitid result to a Popen style return code """
+    if info.si_code == os.CLD_EXITED:
+        return info.si_status
+    return -info.si_status  # killed by a signal
+
+
+class Spawned:
+    """ Just enough of the Popen interface for processes launched with posix_spawn """
+    __slots__ = ('args', 'pid', 'returncode', 'stdin', 'stdout', 'stderr')
+
+    def __init__(self, args, pid):
+        self.args = args
+        self.pid = pid
+        self.returncode = None
+        self.stdin = self.stdout = self.stderr = None  # only descriptors are wired
+
+    def poll(self):
+        if self.returncode is None:
+            info = os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOHANG)
+            if info is not None:
+                self.returncode = exit_status(info)
+        return self.returncode
+
+
+posix_spawnp = getattr(os, 'posix_spawnp', None)  # Python 3.8+
+
+
 def run(*args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, preexec_fn=None):
+    # posix_spawn doesn't need to fork a copy of the interpreter, but it can
+    # only wire existing descriptors and can't run Python code in the child.
+    # Descriptors opened by Python are non-inheritable so no need to close them.
+    if posix_spawnp and preexec_fn is None and subprocess.PIPE not in (stdin, stdout, stderr):
+        pid = posix_spawnp(
+            args[0], args, os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_DUP2, stdin, 0),
+                (os.POSIX_SPAWN_DUP2, stdout, 1),
+                (os.POSIX_SPAWN_DUP2, stderr, 2),
+            ],
+            setsigdef=(signal.SIGPIPE, signal.SIGXFSZ),  # same as restore_signals
+        )
+        return Spawned(args, pid)
+
     return subprocess.Popen(
         args,
         shell=False,  # no need to go via shell
-        bufsize=-1,  # default buffer size
+        bufsize=65536,  # only used if we ask for PIPEs, match our chunks
         executable=None,  # override the command to run from args
 
         # TODO: if we know the redirection in advance we can set it here (devnull, STDOUT)
@@ -122,11 +166,58 @@ pipeline = [ ('dd', 'if=/dev/zero', 'of=/dev/stdout', 'count=1048576',  'bs=1024
 # pipeline = [ ('curl', 'https://as.com'), ('sort', '-r'), ('head', '-10') ]
 # pipeline = [ ('sleep', '10'), ('sleep', '10') ]
 # pipeline = [ ('cat',) ]
+# Slow consumer check, set relay_output below and block our stdout for a bit,
+# every byte must still arrive (4194304 plus the status lines):
+#   python demo-stream.py | (sleep 2; wc -c)
+# pipeline = [ ('dd', 'if=/dev/zero', 'of=/dev/stdout', 'count=4096', 'bs=1024'), ('cat',) ]
+
+# The last stage writes directly to our stdout, set it to forward its output
+# from Python instead.
+relay_output = False
+
 
+import errno
+import fcntl
 
-#XXX: No Windows support when querying file descriptors
-import selectors
-selector = selectors.DefaultSelector()
+splice = getattr(os, 'splice', None)  # Python 3.10+ on Linux
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)  # Linux only
+
+
+def grow_pipe(fd, size=1 << 20):
+    """ Bigger pipes mean less wake ups when moving bulk data """
+    try:
+        fcntl.fcntl(fd, F_SETPIPE_SZ, size)
+    except PermissionError:
+        # unprivileged users can't go over the system limit, settle for it
+        try:
+            with open('/proc/sys/fs/pipe-max-size') as fp:
+                limit = int(fp.read())
+            if limit < size:
+                fcntl.fcntl(fd, F_SETPIPE_SZ, limit)
+        except OSError:
+            pass
+    except OSError:
+        pass  # not a pipe or not on Linux, just use what we have
+
+
+#XXX: No Windows support when querying file descriptors, there we would have
+#     to poll each process with a short sleep between rounds.
+#NOTE: We use epoll directly. The wake up pipe is edge triggered, it's ours and
+#      non-blocking so we can always drain it. The relayed pipe is level
+#      triggered, forwarding it can block on a slow consumer so it's moved a
+#      chunk at a time and epoll keeps reporting it while there is more.
+import select
+epoll = select.epoll()
+
+# Self-pipe trick: once a wakeup fd is set the interpreter writes to it when
+# a signal arrives, so a SIGCHLD wakes up epoll without needing any
+# timeout. It must be installed before spawning so we don't miss an early exit.
+sigrd, sigwr = os.pipe()
+os.set_blocking(sigrd, False)
+os.set_blocking(sigwr, False)
+signal.set_wakeup_fd(sigwr)
+signal.signal(signal.SIGCHLD, lambda signum, frame: None)  # wakeup fd needs a handler
+epoll.register(sigrd, select.EPOLLIN | select.EPOLLET)
 
 jobs = {}
 pgid = None
@@ -159,91 +250,124 @@ pgid = None
 
 #     stdin = rd
 
-for cmd in pipeline:
+# Wire the stages with our own pipes so the kernel connects them directly,
+# the last one writes to our stdout unless we have to relay its output.
+pipes = [os.pipe() for _ in range(len(pipeline) - (0 if relay_output else 1))]
+for rd, wr in pipes:
+    grow_pipe(wr)
 
-    p = run(*cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr)
+for i, cmd in enumerate(pipeline):
+    inp = pipes[i - 1][0] if i > 0 else stdin
+    out = pipes[i][1] if i < len(pipes) else stdout
+
+    p = run(*cmd, stdin=inp, stdout=out, stderr=stderr)
     print('Run <{}> PID: {}'.format(cmd, p.pid))
 
-    extra = (p, stdin, p.stdout.fileno())
-    selector.register(p.stdout, selectors.EVENT_WRITE, extra)
+    # very important to close our copies, otherwise the pipe-right command
+    # won't know when the pipe-left one is done
+    if i > 0:
+        os.close(inp)
+    if i < len(pipes):
+        os.close(out)
 
-    jobs[ p.pid ] = extra
-    stdin = p.stdout.fileno()
+    jobs[ p.pid ] = p
 
 
-#HACK: just use an extra process to forward to stdout
-p = run('cat', stdin=stdin, stdout=stdout, stderr=stderr)
+# Only the relayed pipe is watched, we read from it to forward it to stdout.
+# It stays blocking, with splice a non-blocking pipe makes the write side
+# non-blocking too and then EAGAIN could mean a full stdout as well.
+relaying = relay_output
+if relaying:
+    relay = pipes[-1][0]
+    epoll.register(relay, select.EPOLLIN)
 
 print('Processes launched!!!!!', flush=True)
 
 
-# Polling doesn't block!!!!!!!!!!!
-# TODO: https://docs.python.org/3/library/selectors.html#module-selectors
-import time
+CHUNK = 65536
+buffer = memoryview(bytearray(CHUNK))  # reused for every read, no allocations
 
-cnt = len(jobs)
-while True:
-    events = selector.select(.1)
-    if not events:
-        print('TODO: empty select (timeout) -- fallback to manual polling')
-        continue
+def forward(fd, out):
+    """ Relays a chunk from fd to out, returns the size moved (0 on EOF) """
+    global splice
 
-    for key, mask in events:
-        # print('Wake up from select!', key)
-        p, stdin, stdout = key.data
-        ret = p.poll()
-        if ret is None:
-            continue
+    # Linux can move the pages from the pipe without copying them to userland
+    if splice:
+        try:
+            return splice(fd, out, CHUNK, flags=os.SPLICE_F_MOVE | os.SPLICE_F_MORE)
+        except OSError as ex:
+            if ex.errno != errno.EINVAL:
+                raise
+            splice = None  # out doesn't support it (i.e. opened for appending)
 
-        print('Closing stdin={} stdout={}'.format(stdin, stdout))
+    # straight on the fds, never via Python's buffered file objects
+    size = os.readv(fd, [buffer])
+    data = buffer[:size]
+    while data:
+        data = data[os.writev(out, [data]):]
 
-        try:
-            selector.unregister(stdout)
-        except KeyError:
-            pass  # we might have already closed the pipe-right stdin
+    return size
+
+
+def drain(fd, out):
+    """ Level triggered, so a chunk per wake up is enough, returns False on EOF
+
+        epoll reported fd as readable so reading it won't block, writing can
+        while the consumer catches up but that's just back pressure.
+    """
+    return forward(fd, out) > 0
 
-        #XXX Do we need to close stdin when program ends?
-        try:
-            os.close(stdin)  # might be already closed if pipe-left command terminated first
-        except OSError:
-            pass
 
+def finish(p):
+    ret = p.returncode
+    if ret < 0:
+        print('PID {} Signal {}'.format(p.pid, -ret), flush=True)
+    else:
+        print('PID {} Exit {}'.format(p.pid, ret), flush=True)
+
+
+def reap():
+    """ Collects every child that already exited in a single sweep """
+    while True:
         try:
-            os.close(stdout)   # very important to close so the pipe-right command knows we're done
-        except OSError:
-            pass
+            info = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOHANG)
+        except ChildProcessError:
+            return  # no children left
+
+        if info is None:
+            return  # the rest are still running
+
+        p = jobs.pop(info.si_pid, None)
+        if p is None:
+            continue
+
+        # we already waited for it, avoid Popen doing it again
+        p.returncode = exit_status(info)
+
+        finish(p)
+
+
+# No timeout, we only wake up when there is an actual event to handle
+while jobs or relaying:
+    for fd, events in epoll.poll():
+        if fd == sigrd:
+            try:
+                while os.read(sigrd, 4096):  # we only care about the wake up
+                    pass
+            except BlockingIOError:
+                pass
+            reap()
+            continue
+
+        # print('Wake up from epoll!', fd, events)
+        if drain(fd, stdout):
+            continue
+
+        # EOF, the process is probably gone so try to collect it already
+        epoll.unregister(relay)
+        os.close(relay)
+        relaying = False
+        reap()
 
-        if ret < 0:
-            print('PID {} Signal {}'.format(p.pid, -ret), flush=True)
-        else:
-            print('PID {} Exit {}'.format(p.pid, ret), flush=True)
-
-        cnt -= 1
-
-    if cnt <= 0:
-        selector.close()
-        print('No more jobs')
-        break
-
-    # Sleeping a little bit helps with performance when we have a very chatty
-    # process generating tons of events.
-    time.sleep(.05)
-
-    # # polling based check (windows compatible)
-    # for p, rd, wr in jobs.values():
-    #     ret = p.poll()
-    #     if ret != None:
-    #         if ret < 0:
-    #             print('PID {} Signal {}'.format(p.pid, -ret), flush=True)
-    #         else:
-    #             print('PID {} Exit {}'.format(p.pid, ret), flush=True)
-    #         os.close(rd)
-    #         os.close(wr)
-    #         del jobs[p.pid]
-    #         cnt -= 1
-    #         break
-    # if not jobs:
-    #     print('Finished all jobs!', flush=True)
-    #     break
-
-    # time.sleep(.05)
+epoll.close()
+print('No more jobs')
@@ -1,6 +1,7 @@
 # Pattern matching in Python without transformations
 
 import operator
+from functools import partial
 
 
 class Capture:
@@ -13,37 +14,46 @@ class Capture:
         yield self
 
 
+# Curried comparisons, the operands are swapped so the subject can be bound
+# last without needing a lambda frame (`x < other` is `other > x`).
+_lt, _le, _eq = operator.gt, operator.ge, operator.eq
+_ne, _gt, _ge = operator.ne, operator.lt, operator.le
+_contains = operator.contains
+
+
 class Match:
+    __slots__ = ('subject', 'matched', '_captures')
 
     @staticmethod
-    def lt(cls, other):
-        return lambda x: operator.lt(x, other)
+    def lt(other):
+        return partial(_lt, other)
 
     @staticmethod
-    def le(cls, other):
-        return lambda x: operator.le(x, other)
+    def le(other):
+        return partial(_le, other)
 
     @staticmethod
-    def eq(cls, other):
-        return lambda x: operator.eq(x, other)
+    def eq(other):
+        return partial(_eq, other)
 
     @staticmethod
-    def ne(cls, other):
-        return lambda x: operator.ne(x, other)
+    def ne(other):
+        return partial(_ne, other)
 
     @staticmethod
-    def gt(cls, other):
-        return lambda x: operator.gt(x, other)
+    def gt(other):
+        return partial(_gt, other)
 
     @staticmethod
-    def ge(cls, other):
-        return lambda x: operator.ge(x, other)
+    def ge(other):
+        return partial(_ge, other)
 
     @staticmethod
-    def contains(cls, other):
-        return lambda x: operator.contains(other, x)
+    def contains(other):
+        return partial(_contains, other)
 
     def __init__(self, subject):
+        self._captures = {}
         self.subject = subject
         self.matched = False
 
@@ -54,7 +64,11 @@ class Match:
         self.matched = False
 
     def __getattr__(self, name):
-        return Capture(name)
+        # only reached for names not in the slots, reuse the same capture
+        capture = self._captures.get(name)
+        if capture is None:
+            capture = self._captures[name] = Capture(name)
+        return capture
 
     def __call__(self, pattern=..., **kwargs):
         """
@@ -82,8 +96,8 @@ class Match:
                 return False
         elif kwargs:
             for k, v in kwargs.items():
-                if hasattr(self._subject, k):
-                    setattr(self, v.name, getattr(self._subject, k))
+                if hasattr(self.subject, k):
+                    self._captures[v.name] = getattr(self.subject, k)
                 else:
                     return False
 
@@ -142,7 +156,7 @@ messages = json.loads('''
     ''')
 
 for msg in messages:
-    with Match(foo) as m:
+    with Match(msg) as m:
         if m(name={'first': m.firstname}, age=m.age):
             print('User {} is {} years old'.format(m.firstname, m.age))
 
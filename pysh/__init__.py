@@ -1,11 +1,9 @@
 import os
+import sys
+from importlib import import_module
 
 from .version import __version__
 
-from .dsl import Path, Command
-from .env import Env
-from .command import command, ShSpec
-
 
 # Prelude for scripts
 __all__ = [
@@ -18,10 +16,75 @@ __all__ = [
 ]
 
 
-ENV = Env()
-_ = PWD = Path()
+# Symbols resolved on first access, so importing the package stays cheap
+# when they are not needed (i.e. ``pysh --version``).
+_LAZY_IMPORTS = {
+    'Path': ('.dsl', 'Path'),
+    'Command': ('.dsl', 'Command'),
+    'Env': ('.env', 'Env'),
+    'command': ('.command', 'command'),
+    'ShSpec': ('.command', 'ShSpec'),
+}
+
+_LAZY_NAMES = tuple(_LAZY_IMPORTS) + ('ENV', '_', 'PWD', 'sh')
+
 
-sh = Command(ShSpec())
+def __getattr__(name: str):
+    """ Resolves the lazy symbols (PEP 562), they are cached as globals
+        so this is only called the first time.
+    """
+    if name in _LAZY_IMPORTS:
+        module, attr = _LAZY_IMPORTS[name]
+        value = getattr(import_module(module, __name__), attr)
+    elif name == 'ENV':
+        value = __getattr__('Env')()
+    elif name in ('_', 'PWD'):
+        value = globals()['_'] = globals()['PWD'] = __getattr__('Path')()
+    elif name == 'sh':
+        value = __getattr__('Command')(__getattr__('ShSpec')())
+    else:
+        # submodules not loaded yet, i.e. ``import pysh; pysh.dsl``
+        try:
+            return import_module('.' + name, __name__)
+        except ModuleNotFoundError as ex:
+            if ex.name != '{}.{}'.format(__name__, name):
+                raise
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
+def _register_lazy(name: str) -> None:
+    """ Registers a submodule which is only loaded once one of its attributes
+        is accessed. The import system binds a submodule on the package when
+        it loads it for the first time, for ``pysh.command`` that would shadow
+        the factory with the same name, registering it here means an
+        ``import pysh.command`` never is that first time.
+    """
+    from importlib.util import find_spec, module_from_spec, LazyLoader
+    spec = find_spec(name)
+    assert spec and spec.loader, 'Submodule {} not found'.format(name)
+    loader = spec.loader = LazyLoader(spec.loader)
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+
+_register_lazy(__name__ + '.command')
+
+
+def _resolve(name: str):
+    """ Obtains the value of a prelude symbol, loading it if needed.
+    """
+    value = globals().get(name)
+    if value is None:
+        value = __getattr__(name)
+    return value
 
 
 class ExecOverride:
@@ -35,6 +98,9 @@ class ExecOverride:
     TODO: Merge this interface with ``sh``?
     """
 
+    # resolved on the first call so importing the package stays light
+    _pipeline = None
+
     def __lshift__(self, rhs):
         """
         Allows the ``<<`` operator to provide the pipeline to execute.
@@ -54,8 +120,13 @@ class ExecOverride:
         """
         Overrides the exec builtin so it understands pysh pipelines.
         """
-        if len(args) and hasattr(args[0], '__autoexpr__'):
-            return expr.__autoexpr__()
+        pipeline = ExecOverride._pipeline
+        if pipeline is None:
+            from .dsl import Pipeline as pipeline
+            ExecOverride._pipeline = pipeline
+
+        if args and isinstance(args[0], pipeline):
+            return args[0].__autoexpr__()
         else:
             import builtins
             return builtins.exec(*args, **kwargs)
@@ -79,9 +150,7 @@ class ExitError(Exception):
             error no matter if it was raised from the generic or the specific one.
         """
         if cls is ExitError:
-            concrete = globals().get('Exit{}Error'.format(args[0]))
-            if concrete:
-                return super().__new__(concrete)
+            return super().__new__(_EXIT_ERROR_CLASSES.get(args[0], cls))
 
         return super().__new__(cls)
 
@@ -110,30 +179,28 @@ class _ExitError(ExitError):
         super().__init__(self.status, message)
 
 
-# Some common statuses have specialized version
-class Exit0Error(_ExitError): status = 0
-class Exit1Error(_ExitError): status = 1
-class Exit2Error(_ExitError): status = 2
-class Exit3Error(_ExitError): status = 3
-class Exit4Error(_ExitError): status = 4
-class Exit5Error(_ExitError): status = 5
-class Exit6Error(_ExitError): status = 6
-class Exit7Error(_ExitError): status = 7
-class Exit8Error(_ExitError): status = 8
-class Exit9Error(_ExitError): status = 9
-
-# Also some default instances to raise around when no message is needed
-Exit0 = Exit0Error()
-Exit1 = Exit1Error()
-Exit2 = Exit2Error()
-Exit3 = Exit3Error()
-Exit4 = Exit4Error()
-Exit5 = Exit5Error()
-Exit6 = Exit6Error()
-Exit7 = Exit7Error()
-Exit8 = Exit8Error()
-Exit9 = Exit9Error()
+# Some common statuses have specialized version (``Exit0Error`` ...) and also
+# some default instances (``Exit0`` ...) to raise around when no message is needed
+_EXIT_ERROR_CLASSES = {}
+for _status in range(10):
+    _cls = type('Exit{}Error'.format(_status), (_ExitError,), {'status': _status})
+    _EXIT_ERROR_CLASSES[_status] = globals()[_cls.__name__] = _cls
+    globals()['Exit{}'.format(_status)] = _cls()
+
+del _status, _cls
 
 
 # Augment the prelude with all the Exit stuff
 __all__.extend(k for k in globals() if k.startswith('Exit'))
+
+# Symbols made available to scripts, the lazy ones are resolved on first use
+_PRELUDE = frozenset(__all__) | frozenset(_LAZY_NAMES)
+
+
+# Python 3.6 doesn't support module level __getattr__, resolve them upfront
+if sys.version_info < (3, 7):
+    for _name in _LAZY_NAMES:
+        if _name not in globals():
+            __getattr__(_name)
+
+    del _name
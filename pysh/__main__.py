@@ -15,16 +15,21 @@ Options:
   --debug                 Enables debug mode.
   --quiet                 Enables quiet mode.
   --version               Show version.
+
+Environment:
+  PYSH_NO_CACHE           When set compiled scripts are not cached.
 """
+import os
 import sys
-import re
-import platform
-import logging
-from pathlib import PurePath
+from functools import lru_cache
 
-from docopt import docopt
+# typing is only needed for the annotations, avoid its import time on start up,
+# type checkers treat a TYPE_CHECKING constant like typing.TYPE_CHECKING
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional
 
-import pysh
+from pysh.version import __version__
 
 #TODO: pysh should understand metadata variables and allow to interpolate
 #      them in the docopt. Also use them for packaging.
@@ -52,8 +57,117 @@ EVAL_TRANSFORMS = [
     'pysh.transforms.autoreturn',
 ]
 
-# Start logs in default level
-logging.basicConfig(level=logging.WARN)
+# Only the program name changes between runs, leave it as a format placeholder
+_DOC = __doc__.replace('%version%', __version__).replace('%program%', '{program}')
+
+
+def usage() -> str:
+    """ The docstring for the running program, only needed to report back
+    """
+    return _DOC.format(program=os.path.basename(sys.argv[0]))
+
+# Maps the options from the usage above to their canonical name, for the ones
+# taking a value it's the key of a list/str.
+_FLAGS = {
+    '-h': '--help', '--help': '--help',
+    '-v': '--verbose', '--verbose': '--verbose',
+    '--debug': '--debug',
+    '--quiet': '--quiet',
+    '--version': '--version',
+}
+_VALUES = {
+    '-t': '--transform', '--transform': '--transform',
+    '-e': '--eval', '--eval': '--eval',
+}
+
+
+def parse_argv(argv: 'List[str]') -> 'Dict[str, Any]':
+    """ Parses the command line following the usage in the module docstring.
+
+        It produces the same dictionary docopt would, without having to parse
+        the usage text on every run. Raises ValueError for invalid input.
+    """
+    args: Dict[str, Any] = dict.fromkeys(_FLAGS.values(), False)
+    args.update({'--transform': [], '--eval': None, 'FILE': None, 'SYMBOL': None})
+    positional: List[str] = []
+
+    remaining = iter(argv)
+    for arg in remaining:
+        if arg == '--':
+            positional.extend(remaining)
+            break
+
+        if arg.startswith('--'):
+            name, eq, value = arg.partition('=')
+            if name in _FLAGS and not eq:
+                args[_FLAGS[name]] = True
+                continue
+            if name not in _VALUES:
+                raise ValueError('Unknown option {}'.format(arg))
+            opts = [(name, value if eq else None)]
+        elif arg.startswith('-') and arg != '-':
+            # short options can be grouped, the last one may take a value
+            opts = []
+            rest = arg[1:]
+            while rest:
+                name, rest = '-' + rest[0], rest[1:]
+                if name in _VALUES:
+                    opts.append((name, rest or None))
+                    break
+                opts.append((name, None))
+        else:
+            positional.append(arg)
+            continue
+
+        for name, optvalue in opts:
+            if name in _FLAGS:
+                args[_FLAGS[name]] = True
+                continue
+            if name not in _VALUES:
+                raise ValueError('Unknown option {}'.format(name))
+
+            if optvalue is None:
+                optvalue = next(remaining, None)
+                if optvalue is None:
+                    raise ValueError('Option {} requires a value'.format(name))
+
+            if _VALUES[name] == '--transform':
+                args['--transform'].append(optvalue)
+            else:
+                args[_VALUES[name]] = optvalue
+
+    if len(positional) > 1 or positional and args['--eval'] is not None:
+        raise ValueError('Unexpected argument {}'.format(positional[-1]))
+
+    if positional:
+        args['SYMBOL' if args['--help'] else 'FILE'] = positional[0]
+
+    return args
+
+
+@lru_cache(maxsize=None)
+def version() -> str:
+    """ Version details including the platform, querying it is not free so
+        it's only done when asked for.
+    """
+    import platform
+    return '{} ({} {} - {} {})'.format(
+        __version__,
+        platform.python_implementation(),
+        platform.python_version(),
+        platform.system(),
+        platform.machine())
+
+
+def cache_dir() -> 'Optional[str]':
+    """ Where the compiled scripts are kept, following the XDG convention.
+        None when caching is disabled with ``PYSH_NO_CACHE``.
+    """
+    if os.environ.get('PYSH_NO_CACHE'):
+        return None
+
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'pysh')
 
 
 def eval_and_exit(code: str):
@@ -65,6 +179,7 @@ def eval_and_exit(code: str):
     from io import StringIO
     from pysh.transforms import Compiler
 
+    # snippets are cheap to compile and rarely repeated, don't fill the cache
     compiler = Compiler(EVAL_TRANSFORMS)
 
     code_io = StringIO(code)
@@ -87,68 +202,77 @@ def eval_and_exit(code: str):
 
 # setup.py entrypoint will call this directly
 def main(argv=None):
-    version = '{} ({} {} - {} {})'.format(
-        pysh.__version__,
-        platform.python_implementation(),
-        platform.python_version(),
-        platform.system(),
-        platform.machine())
-
     #TODO: When compiling code from stdin a traceback won't show the lines
     #      since Python cannot open stdin again. We should investigate if
     #      we can keep a copy around and use it for tracebacks.
 
-    #TODO: `--transform foo --transform bar` yields ['foo', 'bar', 'bar']
-    opts = dict(version=pysh.__version__, program=PurePath(sys.argv[0]).name)
-    doc = re.sub(r'%([A-Za-z_]+)%', lambda m: opts[m.group(1)], __doc__)
-    args = docopt(doc, help=False, version=version, argv=argv)
+    try:
+        args = parse_argv(sys.argv[1:] if argv is None else argv)
+    except ValueError as ex:
+        doc = usage()
+        doc = doc[doc.index('Usage:'):doc.index('Options:')].rstrip()
+        raise SystemExit('{}\n{}'.format(ex, doc))
     # print(args)
 
+    if args['--version']:
+        print(version())
+        raise SystemExit(0)
+
     if args['--help']:
         symbol = args['SYMBOL']
         if symbol:
-            if symbol not in pysh.__dict__:
+            import pysh
+
+            if symbol not in pysh._PRELUDE:
                 print('Unknown symbol {}'.format(symbol), file=sys.stderr)
                 raise SystemExit(1)
 
-            help(pysh.__dict__[symbol])
+            help(pysh._resolve(symbol))
         else:
-            print(doc, file=sys.stderr)
+            print(usage(), file=sys.stderr)
 
         raise SystemExit(0)
 
 
-    # Tune log level based on flags
-    if args['--verbose']:
-        logging.getLogger('').setLevel(logging.INFO)
-    elif args['--debug']:
-        logging.getLogger('').setLevel(logging.DEBUG)
-    elif args['--quiet']:
-        logging.getLogger('').setLevel(logging.CRITICAL)
+    # Tune log level based on flags, without any the warnings still reach
+    # stderr via logging's last resort handler
+    level = ('INFO' if args['--verbose'] else
+             'DEBUG' if args['--debug'] else
+             'CRITICAL' if args['--quiet'] else
+             None)
+    if level is not None:
+        import logging
+        logging.basicConfig(level=level)
 
     if args['--eval'] is not None:
         eval_and_exit(args['--eval'])
 
-    if not args['FILE']:
+    # only named scripts are cached, stdin is usually a one off
+    cached = bool(args['FILE'])
+    if not cached:
         args['FILE'] = '/dev/stdin'
 
+    # read it in one go, the file isn't kept open while the script runs
     with open(args['FILE']) as fd:
+        source = fd.read()
+
+    # keeps the order while making additions and removals cheap
+    transforms = dict.fromkeys(SCRIPT_TRANSFORMS)
+    for t in args['--transform']:
+        #TODO: implement properly :)
+        if t.startswith('-'):
+            for name in [x for x in transforms if x.endswith(t[1:])]:
+                del transforms[name]
+        else:
+            transforms[t] = None
 
-        transforms = list(SCRIPT_TRANSFORMS)
-        for t in args['--transform']:
-            #TODO: implement properly :)
-            if t.startswith('-'):
-                transforms = [x for x in transforms if not x.endswith(t[1:])]
-            else:
-                transforms.append(t)
-
-        from pysh.transforms import Compiler
-        compiler = Compiler(transforms)
-        fn = compiler.compile(fd, args['FILE'])
+    from pysh.transforms import Compiler
+    compiler = Compiler(list(transforms), cache_dir=cache_dir() if cached else None)
+    fn = compiler.compile(source, args['FILE'])
 
-        result = fn()
-        if result:  # in case autoexpr is used
-            print(result)
+    result = fn()
+    if result:  # in case autoexpr is used
+        print(result)
 
 
 
@@ -1,14 +1,36 @@
-import os
 from io import FileIO
 from collections import defaultdict
+from functools import lru_cache
 
-from pysh.path import Path
+from pysh.dsl import Path
 
 from typing import cast, Any, Union, Optional, List, Dict, IO
 TArgItem = Union[str, bool]
 TArgValue = Union[None, TArgItem, List[TArgItem]]
 TArgDict = Dict[str, TArgValue]
 
+# values understood as true when converting to a bool, none is over 4 chars
+_TRUE_VALUES = frozenset(('1', 'yes', 'on', 'true', 't'))
+
+# used to detect when a default param is set
+_MISSING: Any = object()
+
+
+@lru_cache(maxsize=256)
+def _make_path(value: str) -> Path:
+    """ Paths are immutable, so the same argument can share its instance
+    """
+    return Path(value)
+
+
+@lru_cache(maxsize=64)
+def _read_at(path: str) -> str:
+    """ Contents of a file referenced with ``@path``, read at most once.
+        A missing file raises, so it's not cached and can be read once created.
+    """
+    with open(path) as fd:
+        return fd.read()
+
 
 class Arguments:
     """
@@ -27,8 +49,7 @@ class Arguments:
 
     TODO: support --no-xxxxx arguments to unset flags.
     """
-    #hack: used to detect when a default param is set
-    DEFAULT: Any = {}
+    DEFAULT = _MISSING  # kept for callers referencing it
 
     HYPHEN = '/dev/stdin'  # default replacement for - in files
 
@@ -41,7 +62,7 @@ class Arguments:
             - ``--`` stops interpreting options
             - anything else is an argument under ``...`` (Ellipsis type)
         """
-        args = cast(Dict[str, List[TArgItem]], defaultdict(lambda: []))
+        args = cast(Dict[str, List[TArgItem]], defaultdict(list))
         args[...] = []
 
         parse_options = True
@@ -56,11 +77,12 @@ class Arguments:
                     args[parts[0]].append(True if len(parts) < 2 else parts[1])
                     continue
                 elif arg.startswith('-'):
-                    for ch in parts[0][1:]:
-                        args['-' + ch].append(True)
+                    keys = ['-' + ch for ch in parts[0][1:]]
+                    for key in keys:
+                        args[key].append(True)
 
                     if len(parts) > 1:
-                        args['-' + parts[0][-1]][-1] = parts[1]
+                        args[keys[-1]][-1] = parts[1]
 
                     continue
 
@@ -80,18 +102,21 @@ class Arguments:
         self._args = args
         self._raise_missing = raise_missing
 
-    def one(self, name: str, *, default=DEFAULT) -> Optional[TArgItem]:
+    def one(self, name: str, *, default=_MISSING) -> Optional[TArgItem]:
         """ Gets a single value for an argument.
 
             - Errors if the argument is unknown!
         """
-        if name not in self._args:
-            if self._raise_missing and default is self.DEFAULT:
+        value = self._args.get(name, _MISSING)
+        if type(value) is str:  # most common case, skip the rest of checks
+            return value
+
+        if value is _MISSING:
+            if self._raise_missing and default is _MISSING:
                 raise RuntimeError('Argument {} not found!'.format(name))
             else:
-                return None if default is self.DEFAULT else default
+                return None if default is _MISSING else default
 
-        value = self._args[name]
         if value is None:
             return None
         elif isinstance(value, str):
@@ -101,16 +126,16 @@ class Arguments:
         else:
             return None
 
-    def many(self, name: str, *, default=DEFAULT) -> List[TArgItem]:
+    def many(self, name: str, *, default=_MISSING) -> List[TArgItem]:
         """ Get all values for an argument.
 
             - Errors if the argument is unknown!
         """
         if name not in self._args:
-            if self._raise_missing and default is self.DEFAULT:
+            if self._raise_missing and default is _MISSING:
                 raise RuntimeError('Argument {} not found!'.format(name))
             else:
-                return [] if default is self.DEFAULT else default
+                return [] if default is _MISSING else default
 
         value = self._args[name]
         if value is None:
@@ -128,13 +153,13 @@ class Arguments:
         """
         return self.one(name, default=default)
 
-    def gets(self, name: str, default: Any = DEFAULT) -> Any:
+    def gets(self, name: str, default: Any = _MISSING) -> Any:
         """ Get the values associated to an argument or a default.
 
             - If the value is not a list it'll be wrapped in one.
             - If it's None an empty list is returned.
         """
-        if default is self.DEFAULT:
+        if default is _MISSING:
             default = []
 
         return self.many(name, default=default)
@@ -146,12 +171,21 @@ class Arguments:
             return self._args.get(name)
 
     def __iter__(self):
-        yield from self._args.items()
+        # hand out dict's own iterator, no generator frame in between
+        return iter(self._args.items())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._args
+
+    def items(self):
+        """ View of the argument names and their raw values
+        """
+        return self._args.items()
 
     def __len__(self):
         return len(self._args)
 
-    def as_path(self, name: str, *, default=DEFAULT) -> Optional[Path]:
+    def as_path(self, name: str, *, default=_MISSING) -> Optional[Path]:
         """ Get argument as a Path
         """
         value = self.one(name, default=default)
@@ -161,16 +195,16 @@ class Arguments:
         if isinstance(value, bool):
             raise RuntimeError('Unable to create path from bool')
 
-        return Path(value)
+        return _make_path(value)
 
-    def as_paths(self, name: str, *, default=DEFAULT) -> List[Path]:
+    def as_paths(self, name: str, *, default=_MISSING) -> List[Path]:
         """ Get arguments as a Path
         """
         paths = []
         for v in self.many(name, default=default):
             if isinstance(v, bool):
                 raise RuntimeError('Unable to create path from bool')
-            paths.append(Path(v))
+            paths.append(_make_path(v))
 
         return paths
 
@@ -184,7 +218,7 @@ class Arguments:
         with open(value, encoding=encoding) as fd:
             return fd.read()
 
-    def as_text(self, name: str, *, encoding=None, hyphen=HYPHEN, default=DEFAULT) -> Optional[str]:
+    def as_text(self, name: str, *, encoding=None, hyphen=HYPHEN, default=_MISSING) -> Optional[str]:
         """ Read the referenced file as text.
 
             - ``-`` will be interpreted as stdin, override with the ``hyphen`` keyword.
@@ -195,7 +229,7 @@ class Arguments:
 
         return self._text(value, encoding, hyphen)
 
-    def as_texts(self, name: str, *, encoding=None, hyphen=HYPHEN, default=DEFAULT) -> List[str]:
+    def as_texts(self, name: str, *, encoding=None, hyphen=HYPHEN, default=_MISSING) -> List[str]:
         """ Read the referenced files as text.
 
             - ``-`` will be interpreted as stdin, override with the ``hyphen`` keyword.
@@ -220,7 +254,7 @@ class Arguments:
         file = open(value, mode=mode, encoding=encoding, buffering=buffering)
         return cast(FileIO, file)
 
-    def as_file(self, name: str, *, mode=None, writeable=False, binary=False, encoding=None, buffering=-1, hyphen=HYPHEN, default=DEFAULT) -> Optional[FileIO]:
+    def as_file(self, name: str, *, mode=None, writeable=False, binary=False, encoding=None, buffering=-1, hyphen=HYPHEN, default=_MISSING) -> Optional[FileIO]:
         """ Returns a file object or raises error if it can't be opened.
 
             - ``-`` will be interpreted as stdin, override with the ``hyphen`` keyword.
@@ -231,7 +265,7 @@ class Arguments:
 
         return self._file(value, mode, writeable, binary, encoding, buffering, hyphen)
 
-    def as_files(self, name: str, *, mode=None, writeable=False, binary=False, encoding=None, buffering=-1, hyphen=HYPHEN, default=DEFAULT) -> List[FileIO]:
+    def as_files(self, name: str, *, mode=None, writeable=False, binary=False, encoding=None, buffering=-1, hyphen=HYPHEN, default=_MISSING) -> List[FileIO]:
         """ Returns file objects or raises error if it can't be opened.
 
             - ``-`` will be interpreted as stdin, override with the ``hyphen`` keyword.
@@ -245,14 +279,15 @@ class Arguments:
         if isinstance(value, bool):
             raise RuntimeError('Unable to get str from bool')
 
-        if value.startswith('@'):
-            if os.path.exists(value[1:]):
-                with open(value[1:]) as fd:
-                    return fd.read()
+        if at_load and value.startswith('@'):
+            try:
+                return _read_at(value[1:])
+            except FileNotFoundError:
+                pass
 
         return value
 
-    def as_str(self, name: str, *, atload=False, default=DEFAULT) -> Optional[str]:
+    def as_str(self, name: str, *, atload=False, default=_MISSING) -> Optional[str]:
         """ Get a string argument.
 
             - When ``atload`` is True and the argument starts with ``@`` then it
@@ -262,9 +297,9 @@ class Arguments:
         if value is None:
             return None
 
-        return self._str(name, atload)
+        return self._str(value, atload)
 
-    def as_strs(self, name: str, *, at=False, default=DEFAULT) -> List[str]:
+    def as_strs(self, name: str, *, at=False, default=_MISSING) -> List[str]:
         """ Get string arguments.
 
             - When ``atload`` is True and the argument starts with ``@`` then it
@@ -279,36 +314,36 @@ class Arguments:
         if isinstance(value, bool):
             return value
 
-        return value.lower() in ('1', 'yes', 'on', 'true', 't')
+        return len(value) <= 4 and value.lower() in _TRUE_VALUES
 
-    def as_bool(self, name: str, *, default=DEFAULT) -> Optional[bool]:
+    def as_bool(self, name: str, *, default=_MISSING) -> Optional[bool]:
         value = self.one(name, default=default)
         if value is None:
             return None
 
         return self._bool(value)
 
-    def as_bools(self, name: str, *, default=DEFAULT) -> List[bool]:
+    def as_bools(self, name: str, *, default=_MISSING) -> List[bool]:
         return [self._bool(v) for v in self.many(name, default=default)]
 
-    def as_int(self, name: str, *, default=DEFAULT) -> Optional[int]:
+    def as_int(self, name: str, *, default=_MISSING) -> Optional[int]:
         value = self.one(name, default=default)
         if value is None:
             return None
 
         return int(value)
 
-    def as_ints(self, name: str, *, default=DEFAULT) -> List[int]:
+    def as_ints(self, name: str, *, default=_MISSING) -> List[int]:
         return [int(v) for v in self.many(name, default=default)]
 
-    def as_float(self, name: str, *, default=DEFAULT) -> Optional[float]:
+    def as_float(self, name: str, *, default=_MISSING) -> Optional[float]:
         value = self.one(name, default=default)
         if value is None:
             return None
 
         return float(value)
 
-    def as_floats(self, name: str, *, default=DEFAULT) -> List[float]:
+    def as_floats(self, name: str, *, default=_MISSING) -> List[float]:
         return [float(v) for v in self.many(name, default=default)]
 
     def len(self, name) -> int:
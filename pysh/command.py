@@ -5,14 +5,36 @@ TODO: check http://harp.pythonanywhere.com/python_doc/library/concurrent.html
 TODO: Check http://www.pixelbeat.org/programming/sigpipe_handling.html
 """
 
+import os
 import re
-from collections import Iterable
+import sys
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import PurePath
-from io import IOBase
 
 from pysh.dsl import Path, Command, Pipeline, BaseSpec
 
-from typing import Optional, Union, List, Tuple, Dict, Callable, Any, cast
+from typing import Optional, Union, List, Tuple, Dict, FrozenSet, Callable, Any
+
+
+_OK_STATUS = frozenset((0,))
+
+# values passed as a single argument even if they could be iterated, numbers
+# can't but listing them saves looking up __iter__ for the common case
+_SCALAR_TYPES = (str, bytes, PurePath, int, float)
+
+# matches ``$name`` and ``${name`` references in a shell snippet
+_VARIABLE_RE = re.compile(r'\$\{?([A-Za-z][A-Za-z0-9_]*)')
+
+
+@lru_cache(maxsize=128)
+def _variable_names(tpl: str) -> Tuple[str, ...]:
+    """ The same snippets get interpolated over and over, scan them just once
+    """
+    if '$' not in tpl:
+        return ()  # most of them don't reference any variable
+
+    return tuple(m.group(1) for m in _VARIABLE_RE.finditer(tpl))
 
 
 def command(*commands: str, **kwargs: Any) -> Union[Command, List[Command]]:
@@ -35,7 +57,14 @@ def command(*commands: str, **kwargs: Any) -> Union[Command, List[Command]]:
     results: List[Command] = []
     for command in commands:
         if isinstance(command, (str, PurePath)):
-            spec = ExternalSpec(command, **kwargs)
+            # types are part of the key since i.e. `repeat=1` is not `repeat=True`
+            key = tuple((k, type(v), v) for k, v in sorted(kwargs.items()))
+            try:
+                hash(key)
+            except TypeError:  # unhashable setting, just build a new one
+                spec = ExternalSpec(command, **kwargs)
+            else:
+                spec = _external_spec(command, key)
         else:
             #TODO: Support functions!
             raise RuntimeError('Only external commands are currently supported!')
@@ -49,6 +78,39 @@ def command(*commands: str, **kwargs: Any) -> Union[Command, List[Command]]:
 
 
 
+@lru_cache(maxsize=256)
+def _external_spec(program: str, key: Tuple[Tuple[str, type, Any], ...]) -> 'ExternalSpec':
+    """ Specs are not modified once built, so the same command with the same
+        settings can share it.
+    """
+    return ExternalSpec(program, **{k: v for k, _, v in key})
+
+
+def _option_emitter(repeat: Union[bool, str], valuepre: Optional[str]) -> Callable[[str, List[str], List[str]], None]:
+    """ Specializes how an option and its values are laid out, the settings
+        are fixed for a spec so there is no need to check them for every option.
+    """
+    if repeat is False:
+        def emit(option, values, result):
+            result.append(option)
+            result += values  #XXX ignores valuepre in this case
+    elif repeat is True and valuepre:
+        def emit(option, values, result):
+            result += [f'{option}{valuepre}{v}' for v in values]
+    elif repeat is True:
+        def emit(option, values, result):
+            for v in values:
+                result += (option, v)
+    elif valuepre:
+        def emit(option, values, result):
+            result.append(f'{option}{valuepre}{repeat.join(values)}')  #XXX custom repeat separator
+    else:
+        def emit(option, values, result):
+            result += (option, repeat.join(values))  #XXX custom repeat separator
+
+    return emit
+
+
 class ExternalSpec(BaseSpec):
     """
     Implementation for external commands.
@@ -68,56 +130,107 @@ class ExternalSpec(BaseSpec):
       joining them with the value of *repeat* if it's a string. When *repeat*
       is *False* additional arguments are placed after the option.
     """
-    __slots__ = ('command', 'ok_status', 'hyphenate', 'repeat', 'short', 'long', 'value', 'false', 'args')
+    __slots__ = ('_program', '_ok_status', '_hyphenate', '_shortpre', '_longpre', '_valuepre', '_argspre', '_repeat',
+                 '_options', '_emit')
 
     def __init__(self, program: str, *,
-                 ok_status=(0,), hyphenate=True, repeat: Union[bool,str] = True,
+                 ok_status=_OK_STATUS, hyphenate=True, repeat: Union[bool,str] = True,
                  short='-', long='--',
                  value: Optional[str] = None, args: Optional[str] = None) -> None:
 
-        self.program = program
-        self.ok_status = tuple([ok_status]) if isinstance(ok_status, int) else ok_status
-        self.hyphenate = hyphenate
-        self.shortpre = short
-        self.longpre = long
-        self.valuepre = value
-        self.argspre = args
-        self.repeat = repeat
-
-    def _parse_option(self, option, value) -> List[str]:
-        if self.hyphenate:
-            option = option.replace('_', '-')
-
-        is_short = 1 == len(option)
-        if not option.startswith('-'):
-            option = (self.shortpre if is_short else self.longpre) + option
-
-        if value is True:
-            return [option]
-        elif value in (False, None):
-            return []
-
-        if isinstance(value, str) or not isinstance(value, Iterable):
-            value = [value]
-
-        if self.repeat is False:
-            return [option] + [str(v) for v in value]  #XXX ignores valuepre in this case
+        # normalized once, checking a status is then a hash lookup
+        ok_status = frozenset((ok_status,) if isinstance(ok_status, int) else ok_status)
+
+        # shared by every spec and command line using them
+        if type(program) is str:
+            program = sys.intern(program)
+        short, long = sys.intern(short), sys.intern(long)
+        if value is not None:
+            value = sys.intern(value)
+        if args is not None:
+            args = sys.intern(args)
+
+        (self._program, self._ok_status, self._hyphenate, self._shortpre,
+         self._longpre, self._valuepre, self._argspre, self._repeat) = \
+            program, ok_status, hyphenate, short, long, value, args, repeat
+
+        # keyword -> final option, the same ones are used again and again
+        self._options: Dict[str, str] = {}
+        self._emit = _option_emitter(repeat, value)
+
+    # command() shares specs between commands, and option names are cached
+    # and their layout specialized for these, so they can't change afterwards
+    @property
+    def program(self) -> str:
+        return self._program
+
+    @property
+    def ok_status(self) -> FrozenSet[int]:
+        return self._ok_status
+
+    @property
+    def argspre(self) -> Optional[str]:
+        return self._argspre
+
+    @property
+    def hyphenate(self) -> bool:
+        return self._hyphenate
+
+    @property
+    def shortpre(self) -> str:
+        return self._shortpre
+
+    @property
+    def longpre(self) -> str:
+        return self._longpre
+
+    @property
+    def repeat(self) -> Union[bool, str]:
+        return self._repeat
+
+    @property
+    def valuepre(self) -> Optional[str]:
+        return self._valuepre
+
+    def _parse_option(self, option, value, result: List[str]) -> None:
+        """ Appends the arguments produced by an option to result """
+        name = self._options.get(option)
+        if name is None:
+            name = option.replace('_', '-') if self._hyphenate else option
+            if not name.startswith('-'):
+                name = (self._shortpre if 1 == len(name) else self._longpre) + name
+            name = self._options[option] = sys.intern(name)
+        option = name
+
+        if type(value) is str:
+            self._emit(option, [value], result)
+            return
+        elif type(value) is bytes:
+            self._emit(option, [os.fsdecode(value)], result)
+            return
+        elif value is True:
+            result.append(option)
+            return
+        elif value is False or value is None:  # not `in`, 0 == False
+            return
+
+        # same as the Iterable ABC check without going through its machinery
+        if isinstance(value, _SCALAR_TYPES) or getattr(type(value), '__iter__', None) is None:
+            self._emit(option, [str(value)], result)
         else:
-            if self.repeat is not True:
-                repeat = cast(str, self.repeat)  #XXX help mypy
-                value = [repeat.join(str(v) for v in value)]  #XXX custom repeat separator
+            self._emit(option, [str(v) for v in value], result)
 
-            if self.valuepre:
-                return [option + self.valuepre + str(v) for v in value]
-            else:
-                return sum([[option, str(v)] for v in value], [])  #XXX flattens the list
-
-    def parse_args(self, positional, keyword) -> List[Any]:
+    def parse_args(self, positional, keyword, result: Optional[List[str]] = None) -> List[Any]:
         """
-
+        Converts the arguments to strings, appending them to ``result`` when
+        given so a whole command line can be built in a single list.
         """
-        result = []
+        if result is None:
+            result = []
+        start = len(result)
+
         # since Python 3.6 keyword order is preserved
+        parse_option = self._parse_option
         for option, value in keyword.items():
             if option == '_':
                 positional = list(positional)
@@ -125,35 +238,44 @@ class ExternalSpec(BaseSpec):
                 continue
 
             #TODO: We need to resolve value at this point to make repeated options reliable
-            result.extend(self._parse_option(option, value))
+            parse_option(option, value, result)
 
         idx_positional = len(result)
 
         #TODO: We need to resolve arg at this point
+        append = result.append
         for arg in positional:
-            if isinstance(arg, str) or not isinstance(arg, Iterable):
-                arg = [arg]
-
-            result.extend(str(x) for x in arg)
+            if type(arg) is str:
+                append(arg)
+            elif type(arg) is bytes:
+                append(os.fsdecode(arg))
+            elif isinstance(arg, _SCALAR_TYPES) or getattr(type(arg), '__iter__', None) is None:
+                append(str(arg))
+            else:
+                result += map(str, arg)
 
-        if self.argspre and self.argspre not in result:
-            test = lambda x: x.startswith(self.shortpre) or x.startswith(self.longpre)
-            if any(test(x) for x in result[idx_positional:]):
-                result.insert(idx_positional, self.argspre)
+        argspre = self._argspre
+        if argspre and argspre not in result[start:]:
+            prefixes = (self._shortpre, self._longpre)
+            if any(x.startswith(prefixes) for x in result[idx_positional:]):
+                result.insert(idx_positional, argspre)
 
         return result
 
     def get_args_for(self, builder: 'Command'):
-        args = []
+        args: List[str] = []
+        argspre = self._argspre
+        emitted = False
         for arg in builder._args:
-            result = self.parse_args(arg.positional, arg.keywords)
+            start = len(args)
+            self.parse_args(arg.positional, arg.keywords, args)
 
             # Make sure we only output argspre once
-            if self.argspre and self.argspre in result:
-                if self.argspre in args:
-                    result = [x for x in result if x != self.argspre]
-
-            args.extend(result)
+            if argspre and argspre in args[start:]:
+                if emitted:
+                    args[start:] = [x for x in args[start:] if x != argspre]
+                else:
+                    emitted = True
 
         return args
 
@@ -161,7 +283,7 @@ class ExternalSpec(BaseSpec):
         raise NotImplementedError('sorry!')
 
     def __repr__(self):
-        return '{}{{{}}})'.format(self.__class__.__name__, self.program)
+        return f'{self.__class__.__name__}{{{self._program}}}'
 
 
 
@@ -175,15 +297,9 @@ class LazyEnvInterpolator:
     def get_frame_vars(back_cnt=2):
         """ Helper to obtain the variables from the scope of a calling frame
         """
-        import inspect
-        from collections import ChainMap
-
-        frame = inspect.currentframe()
+        # same as walking back from inspect.currentframe() without importing it
+        frame = sys._getframe(back_cnt)
         try:
-            while back_cnt:
-                back_cnt -= 1
-                frame = frame.f_back
-
             return ChainMap(frame.f_locals, frame.f_globals)
         finally:
             del frame  # make sure we avoid circular references with the stack
@@ -193,12 +309,8 @@ class LazyEnvInterpolator:
         self.tpl = tpl
         self.vars = vars
 
-    def get_variable_names(self):
-        pattern = r'\$\{?([A-Za-z][A-Za-z0-9_]*)'
-        return [
-            m.group(1)
-            for m in re.finditer(pattern, self.tpl)
-            ]
+    def get_variable_names(self) -> Tuple[str, ...]:
+        return _variable_names(self.tpl)
 
 
 
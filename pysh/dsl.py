@@ -9,14 +9,24 @@ import os
 import re
 import pathlib
 import glob
-from abc import abstractmethod, ABCMeta
 from collections import namedtuple
+from functools import lru_cache
 from io import IOBase
+from types import MappingProxyType
 
 #TODO: Migrate to a custom implementation?
 from braceexpand import braceexpand
 
-from typing import Optional, Union, Iterator, List, Set, Pattern, Callable, Any, cast
+from typing import Optional, Union, Iterator, List, Tuple, Set, FrozenSet, Pattern, Callable, Any, cast
+
+
+# Patterns used while lexing command slices and paths
+_GLOB_RE = re.compile(r'(\\*)[*?[]')
+_ESCAPE_RE = re.compile(r'\\(.)')
+_GLOB_ESCAPE_RE = re.compile(r'\\([*?[])')
+_BRACE_ESCAPE_RE = re.compile(r'\\([*?[\\])')
+# a command slice without any of these is just whitespace separated arguments
+_SPECIAL_SLICE_RE = re.compile(r'[\\{}[\]*?/]')
 
 
 def is_glob(value):
@@ -24,20 +34,20 @@ def is_glob(value):
     """
     return any(
         len(m.group(1)) % 2 == 0
-        for m in re.finditer(r'(\\*)[*?[]', value)
+        for m in _GLOB_RE.finditer(value)
         )
 
 
 def unescape(value):
     """ Removes escapes from a string
     """
-    return re.sub(r'\\(.)', r'\1', value)
+    return _ESCAPE_RE.sub(r'\1', value)
 
 
 def unescape_glob(value):
     """ Keeps escapes of special glob characters using ranges.
     """
-    value = re.sub(r'\\([*?[])', r'[\1]', value)
+    value = _GLOB_ESCAPE_RE.sub(r'[\1]', value)
     return unescape(value)
 
 
@@ -48,7 +58,7 @@ def braceexpansion(value):
 
         See: https://github.com/trendels/braceexpand/issues/2
     """
-    value = re.sub(r'\\([*?[\\])', r'\\\\\1', value)
+    value = _BRACE_ESCAPE_RE.sub(r'\\\\\1', value)
     return list(braceexpand(value))
 
 
@@ -412,23 +422,31 @@ class ExpansionMatcher(PathMatcher):
 # Internal type to hold arguments when constructing commands
 Arg = namedtuple('Arg', ('positional', 'keywords'))
 
+# Keywords of the args without any, read-only since cached args share it
+_NO_KEYWORDS = MappingProxyType({})
+
+# Exit statuses that don't raise, by default and when catching all of them
+_NO_RAISE = frozenset((0,))
+_NO_RAISE_ANY = frozenset(range(256))
+
 
-class BaseSpec:  #TODO: (meta=ABCMeta) breaks?
+class BaseSpec:
     """
-    Base abstract class for representing how a command should execute.
+    Base class for representing how a command should execute, it's an
+    informal interface so nothing checks for the methods when instantiating.
 
     Check :class:`ExternalSpec` for a concrete implementation of the
     interface that allows to run external commands.
     """
+    __slots__ = ()
 
-    @abstractmethod
     def run(self, builder: 'Command'):
         """
         This is a somewhat internal method to execute a builder according to
         the spec. It's intended to be used by :meth:`CommandBuilder.invoke`.
         """
+        raise NotImplementedError()
 
-    @abstractmethod
     def parse_args(self, positional, keyword) -> List[Any]:
         """
         Used by :meth:`CommandBuilder` call and slicing protocols to convert
@@ -436,6 +454,7 @@ class BaseSpec:  #TODO: (meta=ABCMeta) breaks?
 
         .. TODO:: Does it belong in the interface? shouldn't it be part of External?
         """
+        raise NotImplementedError()
 
 class Pipeline:  #TODO: breaks?? (meta=ABCMeta):
     """
@@ -450,6 +469,7 @@ class Pipeline:  #TODO: breaks?? (meta=ABCMeta):
     .. automethod:: __invert__
     .. automethod:: __autoexpr__
     """
+    __slots__ = ()
 
     def __copy__(self):
         cls = self.__class__
@@ -497,14 +517,15 @@ class Pipeline:  #TODO: breaks?? (meta=ABCMeta):
         """
         proc = self.invoke()
         proc.wait()
-        return proc.stdout.read()
+        return proc.stdout
 
     def __str__(self):
         """
         Invoke and get the stdout as text.
         """
-        #TODO: This needs further work to handle the encoding properly
-        return bytes(self).decode('utf-8')
+        proc = self.invoke()
+        proc.wait()
+        return proc.text
 
     def __gt__(self, other) -> 'Redirect':
         """ :ref:`Redirection: >`
@@ -617,6 +638,21 @@ def lex_command_slice(text):
         raise SyntaxError('Unbalanced expression')
 
 
+@lru_cache(maxsize=1024)
+def _slice_args(key: str) -> Tuple[Arg, ...]:
+    """ Slices are mostly literals so the same key is lexed over and over,
+        the produced values are immutable (paths and lazy matchers) so they
+        can be shared.
+    """
+    # nothing to unescape or expand, a plain split does the job
+    if not _SPECIAL_SLICE_RE.search(key):
+        return tuple(Arg((arg,), _NO_KEYWORDS) for arg in key.split())
+
+    return tuple(
+        Arg((unescape(arg) if isinstance(arg, str) else arg,), _NO_KEYWORDS)
+        for arg in lex_command_slice(key))
+
+
 class Command(Pipeline):
     """
     .. automethod:: __lshift__
@@ -627,24 +663,29 @@ class Command(Pipeline):
     def __init__(self, spec: BaseSpec) -> None:
         super().__init__()
         self._spec = spec
-        self._args: List[Arg] = []
-        self._no_raise: List[int] = [0]
+        self._args: Tuple[Arg, ...] = ()
+        self._no_raise: FrozenSet[int] = _NO_RAISE
 
     def __copy__(self) -> 'Command':
+        return self._with_args(())
+
+    def _with_args(self, args: Tuple[Arg, ...]) -> 'Command':
+        """ Clones the command with the given args appended in a single step
+        """
         clone = super().__copy__()
         clone._spec = self._spec
-        clone._args = list(self._args)
-        clone._no_raise = list(self._no_raise)
+        clone._args = self._args + args  # tuples, each step builds a new one
+        clone._no_raise = self._no_raise  # immutable, safe to share
         return clone
 
     def __repr__(self):
         args = []
         for arg in self._args:
-            args.extend('{!r}'.format(v) for v in arg.positional)
-            args.extend('{}={!r}'.format(k,v) for k,v in arg.keyword.items())
+            args.extend(f'{v!r}' for v in arg.positional)
+            args.extend(f'{k}={v!r}' for k, v in arg.keywords.items())
 
-        cmd = '{} {}'.format(self._spec.program, ' '.join(args))
-        return '`{}`'.format(cmd.strip())
+        cmd = f"{self._spec.program} {' '.join(args)}"
+        return f'`{cmd.strip()}`'
 
     def __getitem__(self, key) -> 'Command':
         """
@@ -657,18 +698,10 @@ class Command(Pipeline):
         if isinstance(key, slice):
             raise NotImplementedError()
 
-        clone: Command = self.__copy__()
-
         if type(key) != str:
-            clone._args.append(Arg((key,), {}))
-            return clone
+            return self._with_args((Arg((key,), _NO_KEYWORDS),))
 
-        for arg in lex_command_slice(key):
-            if isinstance(arg, str):
-                arg = unescape(arg)
-            clone._args.append(Arg((arg,), {}))
-
-        return clone
+        return self._with_args(_slice_args(key))
 
     def __getattr__(self, name: str) -> 'Command':
         """
@@ -685,9 +718,7 @@ class Command(Pipeline):
         return self(**{name: True})
 
     def __call__(self, *args, **kwargs) -> 'Command':
-        clone = self.__copy__()
-        clone._args.append(Arg(args, kwargs))
-        return clone
+        return self._with_args((Arg(args, kwargs),))
 
     def io(self, encoding=None, *, stdin=None, stdout=None, stderr=None):
         # encoding: applies to all
@@ -734,9 +765,9 @@ class Command(Pipeline):
 
         clone = self.__copy__()
         if not statuses:
-            clone._no_raise = list(range(256))
+            clone._no_raise = _NO_RAISE_ANY
         else:
-            clone._no_raise = list(statuses)
+            clone._no_raise = frozenset(statuses)
         return clone
 
     def  __lshift__(self, other) -> 'Command':
@@ -757,51 +788,69 @@ class Pipe(Pipeline):
     """
     Represents a pipe ``|`` operation.
     """
+    __slots__ = ('lhs', 'rhs', '_repr')
+
     def __init__(self, lhs: Pipeline, rhs: Pipeline) -> None:
         super().__init__()
         self.lhs = lhs
         self.rhs = rhs
+        self._repr: Optional[str] = None
 
     def __repr__(self):
-        return '({!r} | {!r})'.format(self.lhs, self.rhs)
+        # operands are never reassigned so it can be computed just once
+        if self._repr is None:
+            self._repr = f'({self.lhs!r} | {self.rhs!r})'
+        return self._repr
 
 
 class Piperr(Pipe):
     """
     Represents a piperr ``^`` operation.
     """
+    __slots__ = ()
+
     def __repr__(self):
-        rhs = self.rhs.name if isinstance(self.rhs, IOBase) else repr(self.rhs)
-        return '({!r} ^ {})'.format(self.lhs, rhs)
+        if self._repr is None:
+            rhs = self.rhs.name if isinstance(self.rhs, IOBase) else repr(self.rhs)
+            self._repr = f'({self.lhs!r} ^ {rhs})'
+        return self._repr
 
 
 class Redirect(Pipeline):
     """
     Represents a redirection ``>`` or ``>>`` operation.
     """
+    __slots__ = ('lhs', 'rhs', 'appending', '_repr')
+
     def __init__(self, lhs: Pipeline, rhs: Union[pathlib.PurePath, IOBase], *, appending=False) -> None:
         super().__init__()
         self.lhs = lhs
         self.rhs = rhs
         self.appending = appending
+        self._repr: Optional[str] = None
 
     def __repr__(self):
-        op = '>>' if self.appending else '>'
-        rhs = self.rhs.name if isinstance(self.rhs, IOBase) else repr(self.rhs)
-        return '({!r} {} {})'.format(self.lhs, op, rhs)
+        if self._repr is None:
+            op = '>>' if self.appending else '>'
+            rhs = self.rhs.name if isinstance(self.rhs, IOBase) else repr(self.rhs)
+            self._repr = f'({self.lhs!r} {op} {rhs})'
+        return self._repr
 
 
 class Reckless(Pipeline):
     """
     Represents the reckless operator ``~``
     """
-    __slots__ = ('expr',)
+    __slots__ = ('expr', '_repr')
 
     def __init__(self, expr: Pipeline) -> None:
         self.expr = expr
+        self._repr: Optional[str] = None
 
     def __repr__(self) -> str:
-        return '~{!r}'.format(self.expr)
+        if self._repr is None:
+            self._repr = f'~{self.expr!r}'
+        return self._repr
 
 
 class Application(Pipeline):
@@ -879,27 +928,62 @@ class Application(Pipeline):
         precedence transform so it only operates over ``>`` and ``<``.
 
     """
+    __slots__ = ('lhs', 'rhs', '_repr')
+
     def __init__(self, lhs: Command, rhs: Any) -> None:
         super().__init__()
         self.lhs = lhs
         self.rhs = rhs
+        self._repr: Optional[str] = None
 
     def __repr__(self):
-        return '({!r} << {!r})'.format(self.lhs, self.rhs)
+        if self._repr is None:
+            self._repr = f'({self.lhs!r} << {self.rhs!r})'
+        return self._repr
 
 
 class Result:
-    __slots__ = ('pipeline', 'status', 'stdin', 'stdout', 'stderr')
+    """
+    Tracks the execution of a pipeline. Captured output is accumulated in
+    growable buffers and only frozen into ``bytes`` when it's read.
+    """
+    __slots__ = ('pipeline', 'status', 'stdin', '_stdout', '_stderr', '_stdout_bytes', '_stderr_bytes', '_text')
 
     def __init__(self, pipeline: Pipeline) -> None:
         self.pipeline = pipeline
         self.status: Optional[int] = None
-        self.stdout = b''
-        self.stderr = b''
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        self._stdout_bytes = b''
+        self._stderr_bytes = b''
+        self._text: Optional[str] = None
+
+    @property
+    def stdout(self) -> bytes:
+        # the buffers only grow, so a different size means there is new output
+        if len(self._stdout_bytes) != len(self._stdout):
+            self._stdout_bytes = bytes(self._stdout)
+            self._text = None
+        return self._stdout_bytes
+
+    @property
+    def stderr(self) -> bytes:
+        if len(self._stderr_bytes) != len(self._stderr):
+            self._stderr_bytes = bytes(self._stderr)
+        return self._stderr_bytes
+
+    @property
+    def text(self) -> str:
+        """ The stdout decoded, invalid sequences are replaced instead of failing """
+        #TODO: This needs further work to handle the encoding properly
+        stdout = self.stdout
+        if self._text is None:
+            self._text = stdout.decode('utf-8', errors='replace')
+        return self._text
 
     def wait(self):
         """ Block until the command terminates.
         """
 
     def __repr__(self):
-        return 'Result{{{!r}}}'.format(self.pipeline)
+        return f'Result{{{self.pipeline!r}}}'
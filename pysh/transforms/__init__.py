@@ -43,9 +43,12 @@ TODO: Implement patching support for the DSL:
 import builtins
 import ast
 import logging
+import marshal
+import os
 import re
+import sys
 import tokenize
-from collections import ChainMap
+import warnings
 from io import IOBase, TextIOBase, StringIO
 from importlib import import_module
 from types import FunctionType, CodeType
@@ -144,6 +147,21 @@ def _get_transform_name(transform: Callable):
     return '{}.{}'.format(inspect.getmodule(transform).__name__, transform.__name__)
 
 
+def _module_fingerprint(module: Any) -> str:
+    """ Identifies the code of a transform module, so editing or upgrading it
+        produces a different key for the compiled scripts cached with it.
+    """
+    fname = getattr(module, '__file__', None)
+    if fname:
+        try:
+            st = os.stat(fname)
+            return '{}:{}:{}'.format(fname, st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+
+    return '{}:{}'.format(getattr(module, '__name__', ''), getattr(module, '__version__', ''))
+
+
 def _apply_transform(transform: Callable, obj: Any, fname: str) -> Any:
     try:
         try:
@@ -171,11 +189,21 @@ class Compiler:
         'pysh.transforms.',     # internal
     ]
 
-    def __init__(self, transforms: List[str] = []) -> None:
+    # how many compiled sources are kept in memory per compiler
+    MEMO_SIZE = 256
+    # how many compiled scripts are kept in the cache_dir, least recently used go first
+    CACHE_SIZE = 512
+
+    def __init__(self, transforms: List[str] = [], *, cache_dir: Optional[str] = None) -> None:
         self.lexers: List[Callable] = []
         self.parsers: List[Callable] = []
         self.symbols: Dict[str, Any] = {}
         self.patchers: List[Callable] = []
+        self.transforms: List[str] = []
+        self.fingerprints: List[str] = []
+        self.cache_dir = cache_dir
+        # compiled code for recently seen sources, i.e. snippets eval'ed again and again
+        self._compiled: Dict[Tuple[str, str, Tuple[str, ...]], CodeType] = {}
 
         for transform in transforms:
             self.add_transform(transform)
@@ -217,6 +245,9 @@ class Compiler:
         assert module, 'expected a valid module'
         #TODO: Warn if no lexer or parser was found
 
+        self.transforms.append(transform)
+        self.fingerprints.append(_module_fingerprint(module))
+
         if hasattr(module, 'lexer'):
             logger.debug('Registering lexer from %s', transform)
             self.lexers.append(getattr(module, 'lexer'))
@@ -257,24 +288,132 @@ class Compiler:
 
         return wrapper
 
-    def compile(self, code: TextIOBase, fname='<string>') -> Callable[[], Any]:
+    def compile(self, code: Union[str, TextIOBase], fname='<string>') -> Callable[[], Any]:
         """
         Given some script code it'll perform any configured transformation
         and return a function containing the compiled code. That function can
         be called to execute the script.
+
+        When a ``cache_dir`` is configured the compiled code is kept there,
+        keyed by the source and the transforms, so unchanged scripts skip
+        the transformation and compilation steps on later runs. Scripts for
+        which the transforms issue warnings are never cached, so the warnings
+        are reported on every run.
         """
         #TODO: a way to offset the positions when used as decorator
         #SEE: http://code.activestate.com/recipes/578353-code-to-source-and-back/
 
         name = 'pysh_{}'.format(re.sub(r'\W', '_', fname))
 
-        code = self.lex(code, fname)
-        node = self.parse(code, fname, name)
-        comp = compile(node, fname, 'exec')
+        source = code if isinstance(code, str) else code.read()
+
+        key = (source, fname, tuple(self.transforms))
+        comp = self._compiled.get(key)
+        if comp is None:
+            cache_path = self._cache_path(self.cache_dir, source, fname) if self.cache_dir else None
+            comp = self._load_cache(cache_path) if cache_path else None
+            if comp is None:
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    code = self.lex(StringIO(source), fname)
+                    node = self.parse(code, fname, name)
+                    comp = compile(node, fname, 'exec')
+
+                # report them honoring the caller's filters
+                for w in caught:
+                    warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
+
+                if cache_path and not caught:
+                    self._store_cache(cache_path, comp)
+            else:
+                caught = []
+
+            if not caught:
+                if len(self._compiled) >= self.MEMO_SIZE:
+                    del self._compiled[next(iter(self._compiled))]  # oldest first
+                self._compiled[key] = comp
 
         # Execute to trigger the creation of the wrapping function as a global
-        #TODO: what pysh globals to include?
-        glbls = dict(ChainMap(self.symbols,  pysh.__dict__, builtins.__dict__))
+        # A plain dict keeps the interpreter's fast path for global lookups,
+        # the lazy prelude symbols are only resolved once a script is compiled.
+        # The builtins are copied in since __autoimport__ only checks globals.
+        glbls = dict(builtins.__dict__)
+        glbls.update(
+            __name__='__main__', __doc__=None, __package__=None,
+            __loader__=None, __spec__=None, __builtins__=builtins)
+        # the prelude takes precedence over the builtins (i.e. exec)
+        for symbol in pysh._PRELUDE:
+            glbls[symbol] = pysh._resolve(symbol)
+        glbls.update(self.symbols)
         exec(comp, glbls)
 
         return glbls[name]
+
+    def _cache_path(self, cache_dir: str, source: str, fname: str) -> str:
+        """ The compiled code only depends on these, so when any of them
+            changes we just get a different entry.
+        """
+        import hashlib  # lazy import
+
+        # this module's own fingerprint covers changes on a development install
+        key = '\0'.join([
+            pysh.__version__, sys.implementation.cache_tag,
+            _module_fingerprint(sys.modules[__name__]),
+            fname, *self.transforms, *self.fingerprints, source])
+        digest = hashlib.sha256(key.encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(cache_dir, digest + '.pyc')
+
+    def _load_cache(self, path: str) -> Optional[CodeType]:
+        try:
+            with open(path, 'rb') as fd:
+                comp = marshal.load(fd)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if not isinstance(comp, CodeType):
+            return None
+
+        try:
+            os.utime(path)  # track its use so pruning keeps it
+        except OSError:
+            pass
+
+        logger.debug('Loaded compiled code from %s', path)
+        return comp
+
+    def _store_cache(self, path: str, comp: CodeType) -> None:
+        # write to a temporary file first so a concurrent run never sees it half done
+        cache_dir = os.path.dirname(path)
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp, 'wb') as fd:
+                marshal.dump(comp, fd)
+            os.replace(tmp, path)
+        except OSError as ex:
+            logger.debug('Unable to store compiled code at %s: %s', path, ex)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+
+        self._prune_cache(cache_dir)
+
+    def _prune_cache(self, cache_dir: str) -> None:
+        """ Removes the least recently used entries above :const:`CACHE_SIZE`
+        """
+        entries = []
+        try:
+            for entry in os.scandir(cache_dir):
+                if entry.name.endswith('.pyc'):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            return
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.CACHE_SIZE)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
@@ -12,6 +12,9 @@ from pysh.path import PathWrapper, Path
 from typing import List, Callable, Iterator, Tuple, NamedTuple, Deque, Union, Any
 TBangTransformer = Callable[ [List[str]], Iterator[str]]
 
+_GLOB_RE = re.compile(r'(?!<\\)[~*?{]')
+_ESCAPE_RE = re.compile(r'\\(.)')
+
 
 # runtime symbols
 __all__ = ['BangExpr', 'BangOp', 'BangSeq', 'BangGlob', 'BangEnv', 'BangBang']
@@ -108,13 +111,13 @@ class BangLexer:
                 yield BangToken(BangTokenType.OP, value, pos)
             else:
                 if token == 'OPAQUE':
-                    if re.search(r'(?!<\\)[~*?{]', value):
+                    if _GLOB_RE.search(value):
                         yield BangToken(BangTokenType.GLOB, value, pos)
                     else:
                         yield BangToken(BangTokenType.OPAQUE, value, pos)
                 elif token in ('ESCAPE', 'SQS'):
                     #TODO: handle special escapes \n
-                    value = re.sub(r'\\(.)', r'\1', value)
+                    value = _ESCAPE_RE.sub(r'\1', value)
                     yield BangToken(BangTokenType.OPAQUE, value, pos)
                 elif token in ('VAR', 'EXPR'):
                     value = value.strip()
@@ -125,7 +128,7 @@ class BangLexer:
                             yield BangToken(BangTokenType.LOCAL, value, pos)
                     else:
                         assert token == 'EXPR'
-                        value = re.sub(r'\\(.)', r'\1', value)
+                        value = _ESCAPE_RE.sub(r'\1', value)
                         yield BangToken(BangTokenType.EXPR, value, pos)
                 else:
                     assert False, 'unexpected {}, what happened?'.format(token)
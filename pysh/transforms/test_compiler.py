@@ -0,0 +1,85 @@
+from io import StringIO
+
+import pytest
+
+from pysh.transforms import Compiler
+
+
+def test_compile_cache(tmpdir):
+    comp = Compiler(['autoreturn'], cache_dir=str(tmpdir))
+    assert comp.compile(StringIO('1 + 2'))() == 3
+    assert len(tmpdir.listdir()) == 1
+
+    # a hit doesn't need to run the transforms again
+    comp.parsers.clear()
+    assert comp.compile(StringIO('1 + 2'))() == 3
+    assert len(tmpdir.listdir()) == 1
+
+def test_compile_cache_key(tmpdir):
+    comp = Compiler(['autoreturn'], cache_dir=str(tmpdir))
+    assert comp.compile('1 + 2')() == 3
+    assert comp.compile('1 + 3')() == 4
+    assert comp.compile('1 + 2', 'other')() == 3
+    assert len(tmpdir.listdir()) == 3
+
+    comp = Compiler(cache_dir=str(tmpdir))
+    assert comp.compile('1 + 2')() is None
+    assert len(tmpdir.listdir()) == 4
+
+def test_compile_cache_corrupted(tmpdir):
+    Compiler(['autoreturn'], cache_dir=str(tmpdir)).compile('1 + 2')
+    tmpdir.listdir()[0].write_binary(b'garbage')
+    comp = Compiler(['autoreturn'], cache_dir=str(tmpdir))
+    assert comp.compile('1 + 2')() == 3
+
+def test_compile_memo():
+    comp = Compiler(['autoreturn'])
+    assert comp.compile('1 + 2')() == 3
+
+    # a hit doesn't need to run the transforms again
+    comp.parsers.clear()
+    assert comp.compile('1 + 2')() == 3
+
+    # the file name is part of the key
+    assert comp.compile('1 + 2', 'other')() is None
+
+def test_compile_cache_transform_changed(tmpdir):
+    comp = Compiler(['autoreturn'], cache_dir=str(tmpdir))
+    comp.compile('1 + 2')
+    comp = Compiler(['autoreturn'], cache_dir=str(tmpdir))
+    comp.fingerprints[0] += 'edited'
+    comp.compile('1 + 2')
+    assert len(tmpdir.listdir()) == 2
+
+def test_compile_cache_skips_warnings(tmpdir):
+    comp = Compiler(['shadowing'], cache_dir=str(tmpdir))
+    with pytest.warns(SyntaxWarning):
+        comp.compile('_ = 1')
+    with pytest.warns(SyntaxWarning):
+        comp.compile('_ = 1')
+    assert len(tmpdir.listdir()) == 0
+
+def test_compile_cache_pruned(tmpdir):
+    comp = Compiler(cache_dir=str(tmpdir))
+    comp.CACHE_SIZE = 2
+    for i in range(4):
+        comp.compile('x = {}'.format(i))
+    assert len(tmpdir.listdir()) == 2
+
+def test_compile_prelude():
+    import pysh
+    from pysh.command import command
+    exec_, cmd, env = Compiler(['autoreturn']).compile('(exec, command, ENV)')()
+    assert exec_ is pysh.exec
+    assert cmd is command
+    assert env is pysh.ENV
+
+def test_compile_prelude_globals():
+    import pysh
+    fn = Compiler(['autoreturn']).compile('x = 1')
+    assert type(fn.__globals__) is dict
+    assert fn.__globals__['__name__'] == '__main__'
+    assert fn.__globals__['sh'] is pysh.sh
+
+    fn = Compiler(['autoreturn']).compile('eval("ENV")')
+    assert fn() is pysh.ENV
@@ -0,0 +1,70 @@
+import pytest
+
+from pysh.cli import Arguments
+from pysh.dsl import Path
+
+
+def test_from_argv():
+    args = Arguments.from_argv(['-xv', '-f=foo', '--long', '--opt=1', 'pos', '--', '-z'])
+    assert args['-x'] == [True]
+    assert args['-v'] == [True]
+    assert args['-f'] == ['foo']
+    assert args['--long'] == [True]
+    assert args['--opt'] == ['1']
+    assert args[...] == ['pos', '-z']
+
+def test_from_argv_repeated():
+    args = Arguments.from_argv(['-vv', '--opt=1', '--opt=2'])
+    assert args['-v'] == [True, True]
+    assert args.many('--opt') == ['1', '2']
+    assert args['--missing'] is None
+
+def test_as_bool():
+    args = Arguments.from_argv(['--a=Yes', '--b=off', '--c', '--d=truest', '--e=T'])
+    assert args.as_bool('--a') is True
+    assert args.as_bool('--b') is False
+    assert args.as_bool('--c') is True
+    assert args.as_bool('--d') is False
+    assert args.as_bools('--e') == [True]
+
+def test_as_path():
+    args = Arguments.from_argv(['--out=/tmp/foo', '--in=a', '--in=b'])
+    assert args.as_path('--out') == Path('/tmp/foo')
+    assert args.as_path('--out') is args.as_path('--out')
+    assert args.as_paths('--in') == [Path('a'), Path('b')]
+    assert args.as_path('--missing') is None
+
+def test_iteration():
+    args = Arguments.from_argv(['-v', 'pos'])
+    assert '-v' in args
+    assert '-x' not in args
+    assert dict(args) == {...: ['pos'], '-v': [True]}
+    assert dict(args.items()) == dict(args)
+    assert len(args) == 2
+
+def test_one():
+    args = Arguments.from_docopt({'--str': 'foo', '--list': ['a', 'b'], '--none': None, '--empty': []})
+    assert args.one('--str') == 'foo'
+    assert args.one('--list') == 'a'
+    assert args.one('--none') is None
+    assert args.one('--empty') is None
+    assert args.one('--missing', default='bar') == 'bar'
+    with pytest.raises(RuntimeError):
+        args.one('--missing')
+
+def test_as_str(tmpdir):
+    fname = tmpdir.join('value.txt')
+    fname.write('from file')
+    args = Arguments.from_argv(['--a=foo', '--b=@' + str(fname), '--c=@missing'])
+    assert args.as_str('--a') == 'foo'
+    assert args.as_str('--b') == '@' + str(fname)
+    assert args.as_str('--b', atload=True) == 'from file'
+    assert args.as_str('--c', atload=True) == '@missing'
+    assert args.as_strs('--b', at=True) == ['from file']
+
+def test_as_str_created_later(tmpdir):
+    fname = tmpdir.join('later.txt')
+    args = Arguments.from_argv(['--a=@' + str(fname)])
+    assert args.as_str('--a', atload=True) == '@' + str(fname)
+    fname.write('created')
+    assert args.as_str('--a', atload=True) == 'created'
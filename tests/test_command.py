@@ -2,8 +2,8 @@ import pytest
 
 from pathlib import PurePath
 
-from pysh.command import command, ExternalSpec
-from pysh.dsl import Path, Command, Pipe, Piperr, Redirect, Reckless, Application
+from pysh.command import command, ExternalSpec, LazyEnvInterpolator
+from pysh.dsl import Path, Command, Pipe, Piperr, Redirect, Reckless, Application, Result
 
 foo = command('foo')
 bar = command('bar')
@@ -24,6 +24,30 @@ def test_command_factory():
     assert type(cmd2._spec) is ExternalSpec
     assert cmd2._spec.program == 'cmd2'
 
+def test_command_factory_shares_spec():
+    cmd1, cmd2 = command('cmd'), command('cmd')
+    assert cmd1 is not cmd2
+    assert cmd1._spec is cmd2._spec
+    assert command('cmd', repeat=True)._spec is not command('cmd', repeat=1)._spec
+    assert command('cmd', ok_status=[0, 1])._spec.ok_status == {0, 1}
+    with pytest.raises(TypeError):
+        command('cmd', bogus=True)
+
+def test_command_factory_shared_spec_readonly():
+    cmd1, cmd2 = command('grep', args='--'), command('grep', args='--')
+    for attr, value in (('program', 'egrep'), ('ok_status', {0, 1}), ('argspre', '-')):
+        with pytest.raises(AttributeError):
+            setattr(cmd1._spec, attr, value)
+    assert cmd2._spec.program == 'grep'
+    assert cmd2._spec.ok_status == {0}
+    assert cmd2._spec.argspre == '--'
+
+def test_command_slots():
+    cmd = command('cmd')
+    assert not hasattr(cmd, '__dict__')
+    assert not hasattr(cmd | cmd, '__dict__')
+    assert not hasattr(cmd > null, '__dict__')
+
 
 # pipe
 
@@ -213,3 +237,70 @@ def test_cmd_lshift_redirect():
     assert type(expr.lhs) is Command
     assert len(expr.lhs._args) == 1  #TODO: check it's `bar`
     assert expr.rhs is null
+
+
+# interpolation
+
+def test_interpolator_variable_names():
+    interp = LazyEnvInterpolator('echo $foo ${bar_1} $1 $', {})
+    assert interp.get_variable_names() == ('foo', 'bar_1')
+    assert LazyEnvInterpolator('ls -l', {}).get_variable_names() == ()
+
+
+# catch
+
+def test_catch():
+    assert foo._no_raise == {0}
+    assert foo.catch(1, 3)._no_raise == {1, 3}
+    assert foo.catch()._no_raise == set(range(256))
+
+    cmd = foo.catch(2)
+    assert cmd['bar']._no_raise is cmd._no_raise
+
+
+# args
+
+def test_args_shared():
+    cmd = foo['-a']
+    clone = cmd['-b']('c')
+    assert len(cmd._args) == 1
+    assert len(clone._args) == 3
+    assert clone._args[0] is cmd._args[0]
+
+def test_args_slice_keywords_readonly():
+    cmd = foo['-a -b']
+    with pytest.raises(TypeError):
+        cmd._args[0].keywords['x'] = True
+    assert foo['-a -b']._args[1].keywords == {}
+
+
+# repr
+
+def test_repr():
+    assert repr(foo['-l']('a', b=1)) == "`foo '-l' 'a' b=1`"
+    assert repr(foo._spec) == 'ExternalSpec{foo}'
+
+def test_repr_pipeline():
+    expr = ~(foo | bar['-x'] > null)
+    assert repr(expr) == "~((`foo` | `bar '-x'`) > /dev/null)"
+    assert repr(expr) is repr(expr)
+
+# result
+
+def test_result_capture():
+    result = Result(foo)
+    assert result.stdout == b'' and result.stderr == b''
+    result._stdout += b'foo'
+    result._stdout += b'bar'
+    result._stderr += b'err'
+    assert result.stdout == b'foobar'
+    assert result.stdout is result.stdout
+    assert result.stderr == b'err'
+
+def test_result_text():
+    result = Result(foo)
+    result._stdout += b'caf\xc3\xa9 \xff'
+    assert result.text == 'caf\xe9 \ufffd'
+    assert result.text is result.text
+    result._stdout += b'!'
+    assert result.text.endswith('!')
@@ -2,7 +2,7 @@
 import pytest
 
 from pysh.command import ExternalSpec
-from pysh.dsl import Command
+from pysh.dsl import Command, Path
 
 
 cmd = Command(ExternalSpec('dummy'))
@@ -85,6 +85,8 @@ def test_args_slice():
     assert args(cmd[r'foo\ bar']) == ['foo bar']
     assert args(cmd[r'foo\ \ bar']) == ['foo  bar']
     assert args(cmd['foo\\\tbar']) == ['foo\tbar']
+    assert args(cmd['foo bar']['foo bar']) == ['foo', 'bar', 'foo', 'bar']
+    assert args(cmd[' -a  -b\tc ']) == ['-a', '-b', 'c']
 
 def test_args_repeat():
     assert args(
@@ -115,6 +117,13 @@ def test_args_underscore_positional():
     assert args(cmd('bar', opt=True, _='foo')) == ['--opt', 'bar', 'foo']
     assert args(cmd(opt=True, _=['foo', 'bar'])) == ['--opt', 'foo', 'bar']
 
+def test_args_scalars():
+    assert args(cmd('foo', 10, Path('/tmp'))) == ['foo', '10', '/tmp']
+    assert args(cmd(('foo', 'bar'), range(2))) == ['foo', 'bar', '0', '1']
+    assert args(cmd(opt=Path('/tmp'))) == ['--opt', '/tmp']
+    assert args(cmd(n=0, x=0.0)) == ['-n', '0', '-x', '0.0']
+    assert args(cmd(b'foo', opt=b'bar')) == ['--opt', 'bar', 'foo']
+
 def test_args_attr():
     assert args(cmd.a) == ['-a']
     assert args(cmd.a.b.c) == ['-a', '-b', '-c']
@@ -126,3 +135,26 @@ def test_args_attr():
 
     with pytest.raises(AttributeError):
         cmd._foo  # underscode attributes are reserved
+
+def test_ok_status():
+    assert ExternalSpec('dummy').ok_status == {0}
+    assert ExternalSpec('dummy', ok_status=1).ok_status == {1}
+    assert ExternalSpec('dummy', ok_status=[0, 2]).ok_status == {0, 2}
+    assert ExternalSpec('dummy', ok_status=range(2)).ok_status == {0, 1}
+
+def test_option_names_cached():
+    spec = ExternalSpec('dummy', short='+', long='++', hyphenate=False)
+    assert spec.get_args_for(cmd(a=True, long_opt=True)) == ['+a', '++long_opt']
+    assert spec.get_args_for(cmd(long_opt=True)) == ['++long_opt']
+    for attr in ('hyphenate', 'shortpre', 'longpre'):
+        with pytest.raises(AttributeError):
+            setattr(spec, attr, '-')
+
+def test_layout_readonly():
+    spec = ExternalSpec('dummy', repeat=False, value='=')
+    assert spec.repeat is False
+    assert spec.valuepre == '='
+    with pytest.raises(AttributeError):
+        spec.repeat = True
+    with pytest.raises(AttributeError):
+        spec.valuepre = None
@@ -0,0 +1,15 @@
+from pysh import exec
+from pysh.command import command
+from pysh.dsl import Command
+
+
+def test_exec_code():
+    ns = {}
+    exec('x = 1', ns)
+    assert ns['x'] == 1
+
+def test_exec_pipeline(monkeypatch):
+    monkeypatch.setattr(Command, '__autoexpr__', lambda self: self)
+    cmd = command('cmd')
+    assert exec(cmd) is cmd
+    assert (exec << cmd) is cmd
@@ -0,0 +1,39 @@
+import pytest
+
+from pysh import ExitError, Exit1Error, Exit3Error, Exit3
+
+
+def test_concrete_from_generic():
+    ex = ExitError(3, 'boom')
+    assert type(ex) is Exit3Error
+    assert ex.status == 3
+    assert ex.message == 'boom'
+
+def test_generic_without_concrete():
+    ex = ExitError(42)
+    assert type(ex) is ExitError
+    assert ex.status == 42
+    assert str(ex) == 'Exit:42'
+
+def test_catch_concrete():
+    with pytest.raises(Exit1Error):
+        raise ExitError(1)
+
+def test_concrete_with_message():
+    ex = Exit3Error('boom')
+    assert ex.status == 3
+    assert str(ex) == 'Exit:3: boom'
+
+def test_ready_instances():
+    assert type(Exit3) is Exit3Error
+    assert Exit3.status == 3
+    assert Exit3.message is None
+    assert Exit3Error.status == 3
+
+def test_copy_and_pickle():
+    import copy, pickle
+    ex = ExitError(3, 'boom')
+    for clone in (copy.copy(ex), pickle.loads(pickle.dumps(ex))):
+        assert type(clone) is Exit3Error
+        assert clone.status == 3
+        assert clone.message == 'boom'
@@ -0,0 +1,58 @@
+import pytest
+
+from pysh.__main__ import parse_argv, cache_dir, eval_and_exit
+
+
+def test_parse_defaults():
+    args = parse_argv([])
+    assert args['--transform'] == []
+    assert args['--eval'] is None
+    assert args['FILE'] is None
+    assert not args['--verbose']
+
+def test_parse_file():
+    args = parse_argv(['-v', '--debug', 'script.pysh'])
+    assert args['FILE'] == 'script.pysh'
+    assert args['--verbose'] and args['--debug']
+
+def test_parse_values():
+    args = parse_argv(['-t', 'foo', '--transform=bar', '-vtbaz', '--transform', '-qux'])
+    assert args['--transform'] == ['foo', 'bar', 'baz', '-qux']
+    assert args['--verbose']
+
+def test_parse_eval():
+    assert parse_argv(['-e', '1+1'])['--eval'] == '1+1'
+    assert parse_argv(['--eval=1+1'])['--eval'] == '1+1'
+
+def test_parse_help_symbol():
+    args = parse_argv(['-h', 'Path'])
+    assert args['--help']
+    assert args['SYMBOL'] == 'Path'
+    assert args['FILE'] is None
+
+def test_parse_double_dash():
+    assert parse_argv(['--', '-v'])['FILE'] == '-v'
+
+def test_parse_errors():
+    with pytest.raises(ValueError):
+        parse_argv(['--bogus'])
+    with pytest.raises(ValueError):
+        parse_argv(['-e'])
+    with pytest.raises(ValueError):
+        parse_argv(['-e', '1', 'file'])
+    with pytest.raises(ValueError):
+        parse_argv(['one', 'two'])
+
+def test_cache_dir(monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', '/tmp/xdg')
+    monkeypatch.delenv('PYSH_NO_CACHE', raising=False)
+    assert cache_dir() == '/tmp/xdg/pysh'
+    monkeypatch.setenv('PYSH_NO_CACHE', '1')
+    assert cache_dir() is None
+
+@pytest.mark.parametrize('code', ['ENV', 'command', 'Exit3'])
+def test_eval_prelude(code, capsys):
+    with pytest.raises(SystemExit) as exc:
+        eval_and_exit(code)
+    assert exc.value.code == 0
+    assert capsys.readouterr().out
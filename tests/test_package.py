@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+import pysh
+import pysh.command
+
+
+def test_submodule_attribute():
+    assert pysh.dsl.Path is pysh.Path
+
+def test_command_factory_not_shadowed():
+    # the submodule is imported first, it must not replace the factory
+    from pysh import command
+    assert command is sys.modules['pysh.command'].command
+    assert pysh._resolve('command') is command
+
+def test_command_submodule_imported_first():
+    # a fresh interpreter so nothing else loaded the submodule already
+    code = 'import pysh.command; print(type(pysh.command).__name__, pysh.command.__module__)'
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.split() == [b'function', b'pysh.command']